@@ -1,15 +1,17 @@
-import requests
 import json
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import threading
+from currency_data import RATES_URL, RateSnapshot, load_offline_rates
+from currency_format import format_amount
+from rate_ingest import RateBook, fetch_rate_items
 
 class CompactModernConverter:
-    def __init__(self):
-        self.rates = {}
-        self.currency_symbols = {}
-        self.last_update = None
+    def __init__(self, rates_url=RATES_URL):
+        self.rates_url = rates_url
+        self.snapshot = None
+        self.rate_book = RateBook()
         self.load_data()
         self.create_compact_modern_gui()
         self.fetch_live_rates()
@@ -17,30 +19,7 @@ class CompactModernConverter:
     
     def load_data(self):
         """Load offline currency data"""
-        try:
-            with open('currencyData.txt', 'r') as f:
-                lines = f.readlines()
-            
-            for line in lines:
-                try:
-                    parts = line.strip().split('\t')
-                    if len(parts) >= 2:
-                        currency = parts[0]
-                        rate = float(parts[1])
-                        self.rates[currency] = rate
-                except:
-                    continue
-            
-            self.rates['Indian Rupee'] = 1.0
-            
-        except FileNotFoundError:
-            self.rates = {
-                'Indian Rupee': 1.0,
-                'US Dollar': 0.013588,
-                'Euro': 0.011175,
-                'British Pound': 0.010200,
-                'Japanese Yen': 1.413723
-            }
+        self.snapshot = RateSnapshot(load_offline_rates('currencyData.txt'))
     
     def create_compact_modern_gui(self):
         """Create compact modern interface"""
@@ -349,225 +328,13 @@ class CompactModernConverter:
         """Fetch live rates for ALL available currencies"""
         def fetch():
             try:
-                # First, get all supported currencies
-                currencies_url = "https://api.exchangerate-api.com/v4/latest/USD"
-                response = requests.get(currencies_url, timeout=15)
-                response.raise_for_status()
-                
-                data = response.json()
-                rates = data.get('rates', {})
-                
-                # Comprehensive currency mapping with full names and symbols
-                currency_map = {
-                    'AED': {'name': 'UAE Dirham', 'symbol': 'د.إ'},
-                    'AFN': {'name': 'Afghan Afghani', 'symbol': '؋'},
-                    'ALL': {'name': 'Albanian Lek', 'symbol': 'L'},
-                    'AMD': {'name': 'Armenian Dram', 'symbol': '֏'},
-                    'ANG': {'name': 'Netherlands Antillean Guilder', 'symbol': 'ƒ'},
-                    'AOA': {'name': 'Angolan Kwanza', 'symbol': 'Kz'},
-                    'ARS': {'name': 'Argentine Peso', 'symbol': '$'},
-                    'AUD': {'name': 'Australian Dollar', 'symbol': 'A$'},
-                    'AWG': {'name': 'Aruban Florin', 'symbol': 'ƒ'},
-                    'AZN': {'name': 'Azerbaijani Manat', 'symbol': '₼'},
-                    'BAM': {'name': 'Bosnia-Herzegovina Convertible Mark', 'symbol': 'KM'},
-                    'BBD': {'name': 'Barbadian Dollar', 'symbol': '$'},
-                    'BDT': {'name': 'Bangladeshi Taka', 'symbol': '৳'},
-                    'BGN': {'name': 'Bulgarian Lev', 'symbol': 'лв'},
-                    'BHD': {'name': 'Bahraini Dinar', 'symbol': '.د.ب'},
-                    'BIF': {'name': 'Burundian Franc', 'symbol': 'FBu'},
-                    'BMD': {'name': 'Bermudan Dollar', 'symbol': '$'},
-                    'BND': {'name': 'Brunei Dollar', 'symbol': '$'},
-                    'BOB': {'name': 'Bolivian Boliviano', 'symbol': 'Bs.'},
-                    'BRL': {'name': 'Brazilian Real', 'symbol': 'R$'},
-                    'BSD': {'name': 'Bahamian Dollar', 'symbol': '$'},
-                    'BTC': {'name': 'Bitcoin', 'symbol': '₿'},
-                    'BTN': {'name': 'Bhutanese Ngultrum', 'symbol': 'Nu.'},
-                    'BWP': {'name': 'Botswanan Pula', 'symbol': 'P'},
-                    'BYN': {'name': 'New Belarusian Ruble', 'symbol': 'Br'},
-                    'BZD': {'name': 'Belize Dollar', 'symbol': 'BZ$'},
-                    'CAD': {'name': 'Canadian Dollar', 'symbol': 'C$'},
-                    'CDF': {'name': 'Congolese Franc', 'symbol': 'FC'},
-                    'CHF': {'name': 'Swiss Franc', 'symbol': 'CHF'},
-                    'CLP': {'name': 'Chilean Peso', 'symbol': '$'},
-                    'CNY': {'name': 'Chinese Yuan', 'symbol': '¥'},
-                    'COP': {'name': 'Colombian Peso', 'symbol': '$'},
-                    'CRC': {'name': 'Costa Rican Colón', 'symbol': '₡'},
-                    'CUC': {'name': 'Cuban Convertible Peso', 'symbol': '$'},
-                    'CUP': {'name': 'Cuban Peso', 'symbol': '₱'},
-                    'CVE': {'name': 'Cape Verdean Escudo', 'symbol': '$'},
-                    'CZK': {'name': 'Czech Republic Koruna', 'symbol': 'Kč'},
-                    'DJF': {'name': 'Djiboutian Franc', 'symbol': 'Fdj'},
-                    'DKK': {'name': 'Danish Krone', 'symbol': 'kr'},
-                    'DOP': {'name': 'Dominican Peso', 'symbol': 'RD$'},
-                    'DZD': {'name': 'Algerian Dinar', 'symbol': 'دج'},
-                    'EGP': {'name': 'Egyptian Pound', 'symbol': '£'},
-                    'ERN': {'name': 'Eritrean Nakfa', 'symbol': 'Nfk'},
-                    'ETB': {'name': 'Ethiopian Birr', 'symbol': 'Br'},
-                    'EUR': {'name': 'Euro', 'symbol': '€'},
-                    'FJD': {'name': 'Fijian Dollar', 'symbol': '$'},
-                    'FKP': {'name': 'Falkland Islands Pound', 'symbol': '£'},
-                    'GBP': {'name': 'British Pound Sterling', 'symbol': '£'},
-                    'GEL': {'name': 'Georgian Lari', 'symbol': '₾'},
-                    'GGP': {'name': 'Guernsey Pound', 'symbol': '£'},
-                    'GHS': {'name': 'Ghanaian Cedi', 'symbol': '¢'},
-                    'GIP': {'name': 'Gibraltar Pound', 'symbol': '£'},
-                    'GMD': {'name': 'Gambian Dalasi', 'symbol': 'D'},
-                    'GNF': {'name': 'Guinean Franc', 'symbol': 'FG'},
-                    'GTQ': {'name': 'Guatemalan Quetzal', 'symbol': 'Q'},
-                    'GYD': {'name': 'Guyanaese Dollar', 'symbol': '$'},
-                    'HKD': {'name': 'Hong Kong Dollar', 'symbol': 'HK$'},
-                    'HNL': {'name': 'Honduran Lempira', 'symbol': 'L'},
-                    'HRK': {'name': 'Croatian Kuna', 'symbol': 'kn'},
-                    'HTG': {'name': 'Haitian Gourde', 'symbol': 'G'},
-                    'HUF': {'name': 'Hungarian Forint', 'symbol': 'Ft'},
-                    'IDR': {'name': 'Indonesian Rupiah', 'symbol': 'Rp'},
-                    'ILS': {'name': 'Israeli New Sheqel', 'symbol': '₪'},
-                    'IMP': {'name': 'Manx pound', 'symbol': '£'},
-                    'INR': {'name': 'Indian Rupee', 'symbol': '₹'},
-                    'IQD': {'name': 'Iraqi Dinar', 'symbol': 'ع.د'},
-                    'IRR': {'name': 'Iranian Rial', 'symbol': '﷼'},
-                    'ISK': {'name': 'Icelandic Króna', 'symbol': 'kr'},
-                    'JEP': {'name': 'Jersey Pound', 'symbol': '£'},
-                    'JMD': {'name': 'Jamaican Dollar', 'symbol': 'J$'},
-                    'JOD': {'name': 'Jordanian Dinar', 'symbol': 'JD'},
-                    'JPY': {'name': 'Japanese Yen', 'symbol': '¥'},
-                    'KES': {'name': 'Kenyan Shilling', 'symbol': 'KSh'},
-                    'KGS': {'name': 'Kyrgystani Som', 'symbol': 'лв'},
-                    'KHR': {'name': 'Cambodian Riel', 'symbol': '៛'},
-                    'KMF': {'name': 'Comorian Franc', 'symbol': 'CF'},
-                    'KPW': {'name': 'North Korean Won', 'symbol': '₩'},
-                    'KRW': {'name': 'South Korean Won', 'symbol': '₩'},
-                    'KWD': {'name': 'Kuwaiti Dinar', 'symbol': 'KD'},
-                    'KYD': {'name': 'Cayman Islands Dollar', 'symbol': '$'},
-                    'KZT': {'name': 'Kazakhstani Tenge', 'symbol': '₸'},
-                    'LAK': {'name': 'Laotian Kip', 'symbol': '₭'},
-                    'LBP': {'name': 'Lebanese Pound', 'symbol': '£'},
-                    'LKR': {'name': 'Sri Lankan Rupee', 'symbol': '₨'},
-                    'LRD': {'name': 'Liberian Dollar', 'symbol': '$'},
-                    'LSL': {'name': 'Lesotho Loti', 'symbol': 'M'},
-                    'LYD': {'name': 'Libyan Dinar', 'symbol': 'LD'},
-                    'MAD': {'name': 'Moroccan Dirham', 'symbol': 'MAD'},
-                    'MDL': {'name': 'Moldovan Leu', 'symbol': 'lei'},
-                    'MGA': {'name': 'Malagasy Ariary', 'symbol': 'Ar'},
-                    'MKD': {'name': 'Macedonian Denar', 'symbol': 'ден'},
-                    'MMK': {'name': 'Myanma Kyat', 'symbol': 'K'},
-                    'MNT': {'name': 'Mongolian Tugrik', 'symbol': '₮'},
-                    'MOP': {'name': 'Macanese Pataca', 'symbol': 'MOP$'},
-                    'MRO': {'name': 'Mauritanian Ouguiya', 'symbol': 'UM'},
-                    'MRU': {'name': 'Mauritanian Ouguiya', 'symbol': 'UM'},
-                    'MUR': {'name': 'Mauritian Rupee', 'symbol': '₨'},
-                    'MVR': {'name': 'Maldivian Rufiyaa', 'symbol': 'Rf'},
-                    'MWK': {'name': 'Malawian Kwacha', 'symbol': 'MK'},
-                    'MXN': {'name': 'Mexican Peso', 'symbol': '$'},
-                    'MYR': {'name': 'Malaysian Ringgit', 'symbol': 'RM'},
-                    'MZN': {'name': 'Mozambican Metical', 'symbol': 'MT'},
-                    'NAD': {'name': 'Namibian Dollar', 'symbol': '$'},
-                    'NGN': {'name': 'Nigerian Naira', 'symbol': '₦'},
-                    'NIO': {'name': 'Nicaraguan Córdoba', 'symbol': 'C$'},
-                    'NOK': {'name': 'Norwegian Krone', 'symbol': 'kr'},
-                    'NPR': {'name': 'Nepalese Rupee', 'symbol': '₨'},
-                    'NZD': {'name': 'New Zealand Dollar', 'symbol': 'NZ$'},
-                    'OMR': {'name': 'Omani Rial', 'symbol': '﷼'},
-                    'PAB': {'name': 'Panamanian Balboa', 'symbol': 'B/.'},
-                    'PEN': {'name': 'Peruvian Nuevo Sol', 'symbol': 'S/.'},
-                    'PGK': {'name': 'Papua New Guinean Kina', 'symbol': 'K'},
-                    'PHP': {'name': 'Philippine Peso', 'symbol': '₱'},
-                    'PKR': {'name': 'Pakistani Rupee', 'symbol': '₨'},
-                    'PLN': {'name': 'Polish Zloty', 'symbol': 'zł'},
-                    'PYG': {'name': 'Paraguayan Guarani', 'symbol': 'Gs'},
-                    'QAR': {'name': 'Qatari Rial', 'symbol': '﷼'},
-                    'RON': {'name': 'Romanian Leu', 'symbol': 'lei'},
-                    'RSD': {'name': 'Serbian Dinar', 'symbol': 'Дин.'},
-                    'RUB': {'name': 'Russian Ruble', 'symbol': '₽'},
-                    'RWF': {'name': 'Rwandan Franc', 'symbol': 'R₣'},
-                    'SAR': {'name': 'Saudi Riyal', 'symbol': '﷼'},
-                    'SBD': {'name': 'Solomon Islands Dollar', 'symbol': '$'},
-                    'SCR': {'name': 'Seychellois Rupee', 'symbol': '₨'},
-                    'SDG': {'name': 'Sudanese Pound', 'symbol': 'ج.س.'},
-                    'SEK': {'name': 'Swedish Krona', 'symbol': 'kr'},
-                    'SGD': {'name': 'Singapore Dollar', 'symbol': 'S$'},
-                    'SHP': {'name': 'Saint Helena Pound', 'symbol': '£'},
-                    'SLE': {'name': 'Sierra Leonean Leone', 'symbol': 'Le'},
-                    'SLL': {'name': 'Sierra Leonean Leone', 'symbol': 'Le'},
-                    'SOS': {'name': 'Somali Shilling', 'symbol': 'S'},
-                    'SRD': {'name': 'Surinamese Dollar', 'symbol': '$'},
-                    'STD': {'name': 'São Tomé and Príncipe Dobra', 'symbol': 'Db'},
-                    'STN': {'name': 'São Tomé and Príncipe Dobra', 'symbol': 'Db'},
-                    'SVC': {'name': 'Salvadoran Colón', 'symbol': '$'},
-                    'SYP': {'name': 'Syrian Pound', 'symbol': '£'},
-                    'SZL': {'name': 'Swazi Lilangeni', 'symbol': 'E'},
-                    'THB': {'name': 'Thai Baht', 'symbol': '฿'},
-                    'TJS': {'name': 'Tajikistani Somoni', 'symbol': 'SM'},
-                    'TMT': {'name': 'Turkmenistani Manat', 'symbol': 'T'},
-                    'TND': {'name': 'Tunisian Dinar', 'symbol': 'د.ت'},
-                    'TOP': {'name': 'Tongan Paʻanga', 'symbol': 'T$'},
-                    'TRY': {'name': 'Turkish Lira', 'symbol': '₺'},
-                    'TTD': {'name': 'Trinidad and Tobago Dollar', 'symbol': 'TT$'},
-                    'TWD': {'name': 'New Taiwan Dollar', 'symbol': 'NT$'},
-                    'TZS': {'name': 'Tanzanian Shilling', 'symbol': 'TSh'},
-                    'UAH': {'name': 'Ukrainian Hryvnia', 'symbol': '₴'},
-                    'UGX': {'name': 'Ugandan Shilling', 'symbol': 'USh'},
-                    'USD': {'name': 'US Dollar', 'symbol': '$'},
-                    'UYU': {'name': 'Uruguayan Peso', 'symbol': '$U'},
-                    'UZS': {'name': 'Uzbekistan Som', 'symbol': 'лв'},
-                    'VED': {'name': 'Venezuelan Bolívar', 'symbol': 'Bs'},
-                    'VES': {'name': 'Venezuelan Bolívar', 'symbol': 'Bs'},
-                    'VND': {'name': 'Vietnamese Dong', 'symbol': '₫'},
-                    'VUV': {'name': 'Vanuatu Vatu', 'symbol': 'VT'},
-                    'WST': {'name': 'Samoan Tala', 'symbol': 'WS$'},
-                    'XAF': {'name': 'CFA Franc BEAC', 'symbol': 'FCFA'},
-                    'XAG': {'name': 'Silver (troy ounce)', 'symbol': 'XAG'},
-                    'XAU': {'name': 'Gold (troy ounce)', 'symbol': 'XAU'},
-                    'XCD': {'name': 'East Caribbean Dollar', 'symbol': '$'},
-                    'XDR': {'name': 'Special Drawing Rights', 'symbol': 'SDR'},
-                    'XOF': {'name': 'CFA Franc BCEAO', 'symbol': 'CFA'},
-                    'XPD': {'name': 'Palladium Ounce', 'symbol': 'XPD'},
-                    'XPF': {'name': 'CFP Franc', 'symbol': '₣'},
-                    'XPT': {'name': 'Platinum Ounce', 'symbol': 'XPT'},
-                    'YER': {'name': 'Yemeni Rial', 'symbol': '﷼'},
-                    'ZAR': {'name': 'South African Rand', 'symbol': 'R'},
-                    'ZMW': {'name': 'Zambian Kwacha', 'symbol': 'ZK'},
-                    'ZWL': {'name': 'Zimbabwean Dollar', 'symbol': 'Z$'},
-                }
-                
-                # Now get rates in terms of USD and convert to INR base
-                usd_to_inr = rates.get('INR', 83.0)  # Fallback rate
+                # Stream the payload and apply only the rates that moved
+                delta = self.rate_book.apply(fetch_rate_items(self.rates_url))
                 
-                live_rates = {}
-                self.currency_symbols = {}
-                
-                # Add all available currencies from the API
-                for code, usd_rate in rates.items():
-                    if code in currency_map and usd_rate > 0:
-                        curr_info = currency_map[code]
-                        currency_name = curr_info['name']
-                        
-                        # Convert USD rate to INR base rate
-                        if code == 'INR':
-                            inr_rate = 1.0
-                        elif code == 'USD':
-                            inr_rate = 1.0 / usd_to_inr
-                        else:
-                            inr_rate = usd_rate / usd_to_inr
-                        
-                        live_rates[currency_name] = inr_rate
-                        self.currency_symbols[currency_name] = curr_info['symbol']
-                
-                # Add any missing important currencies that might not be in rates
-                important_missing = {
-                    'Indian Rupee': {'rate': 1.0, 'symbol': '₹'}
-                }
-                
-                for curr_name, info in important_missing.items():
-                    if curr_name not in live_rates:
-                        live_rates[curr_name] = info['rate']
-                        self.currency_symbols[curr_name] = info['symbol']
-                
-                if live_rates:
-                    self.rates = live_rates
-                    self.last_update = datetime.now()
-                    self.root.after(0, self.update_after_fetch)
-                    print(f"✅ Fetched {len(live_rates)} live currency rates from {len(rates)} available currencies")
+                # Rates, symbols and timestamp are swapped in as one reference
+                snapshot = self.snapshot = self.rate_book.snapshot
+                self.root.after(0, self.update_after_fetch, delta.names_changed)
+                print(f"✅ Applied {delta.count} rate changes ({len(snapshot.rates)} live currency rates)")
                     
             except Exception as e:
                 print(f"❌ Error fetching rates: {e}")
@@ -575,9 +342,24 @@ class CompactModernConverter:
         
         threading.Thread(target=fetch, daemon=True).start()
     
-    def update_after_fetch(self):
+    def update_after_fetch(self, names_changed=True):
         """Update UI after fetching rates"""
-        currencies = sorted(self.rates.keys())
+        # Currency lists only need rebuilding when currencies came or went
+        if names_changed:
+            self.update_currency_lists()
+        
+        # Update status
+        snapshot = self.snapshot
+        count = len(snapshot.rates)
+        time_str = snapshot.last_update.strftime('%H:%M:%S')
+        self.status_label.config(text=f"✅ {count} live rates • {time_str}")
+        self.status_canvas.itemconfig(self.status_dot, fill='#00b894', outline='#00cec9')
+        
+        self.convert_now()
+    
+    def update_currency_lists(self):
+        """Refresh combobox values, keeping the current selections where possible"""
+        currencies = sorted(self.snapshot.rates.keys())
         
         # Update comboboxes
         current_from = self.from_var.get()
@@ -602,14 +384,6 @@ class CompactModernConverter:
             self.to_var.set(currencies[1])
         elif currencies:
             self.to_var.set(currencies[0])
-        
-        # Update status
-        count = len(currencies)
-        time_str = self.last_update.strftime('%H:%M:%S')
-        self.status_label.config(text=f"✅ {count} live rates • {time_str}")
-        self.status_canvas.itemconfig(self.status_dot, fill='#00b894', outline='#00cec9')
-        
-        self.convert_now()
     
     def update_status_error(self):
         """Update status on error"""
@@ -618,7 +392,7 @@ class CompactModernConverter:
     
     def setup_initial_currencies(self):
         """Setup initial currency values"""
-        currencies = sorted(self.rates.keys())
+        currencies = sorted(self.snapshot.rates.keys())
         self.from_combo['values'] = currencies
         self.to_combo['values'] = currencies
         
@@ -686,40 +460,20 @@ class CompactModernConverter:
                 self.rate_info_label.config(text="")
                 return
             
-            if from_currency == to_currency:
-                result = amount
-            else:
-                # Convert via INR
-                if from_currency == 'Indian Rupee':
-                    inr_amount = amount
-                else:
-                    inr_amount = amount / self.rates.get(from_currency, 1)
-                
-                if to_currency == 'Indian Rupee':
-                    result = inr_amount
-                else:
-                    result = inr_amount * self.rates.get(to_currency, 1)
-            
-            # Format result
-            if result >= 1000000:
-                formatted = f"{result:,.2f}"
-            elif result >= 100:
-                formatted = f"{result:,.2f}"
-            elif result >= 1:
-                formatted = f"{result:.4f}"
-            else:
-                formatted = f"{result:.6f}".rstrip('0').rstrip('.')
+            # Read the snapshot once so rates and symbols come from the same refresh
+            snapshot = self.snapshot
+            result = snapshot.convert(amount, from_currency, to_currency)
             
             # Get currency symbol
-            symbol = self.currency_symbols.get(to_currency, '')
+            symbol = snapshot.currency_symbols.get(to_currency, '')
             
             # Update result display
-            self.result_label.config(text=f"{symbol}{formatted}")
+            self.result_label.config(text=format_amount(result, to_currency))
             
             # Show exchange rate
             if from_currency != to_currency and amount > 0:
                 rate = result / amount
-                from_symbol = self.currency_symbols.get(from_currency, '')
+                from_symbol = snapshot.currency_symbols.get(from_currency, '')
                 rate_text = f"1 {from_symbol} = {rate:.4f} {symbol}"
                 self.rate_info_label.config(text=rate_text)
             else:
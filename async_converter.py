@@ -0,0 +1,127 @@
+"""Asyncio-native currency converter client (no Tk required)"""
+import asyncio
+
+from currency_data import RATES_URL, RateSnapshot, load_offline_rates
+from currency_format import format_amount
+from rate_ingest import RateBook, fetch_rate_items
+
+
+class AsyncCurrencyConverter:
+    """Converter for asyncio services.
+
+    Lookups are plain method calls against the current ``RateSnapshot`` and
+    never block or await, so any number of concurrent tasks can convert
+    without extra threads. Only ``refresh`` touches the network: the blocking
+    HTTP call and the delta apply run once in the loop's default executor and
+    concurrent callers share that single in-flight refresh.
+
+    ``fetcher(url, timeout)`` must return an iterable of (code, usd_rate) pairs.
+    """
+
+    def __init__(self, url=RATES_URL, offline_path='currencyData.txt', timeout=15,
+                 fetcher=fetch_rate_items):
+        self.url = url
+        self.timeout = timeout
+        self.fetcher = fetcher
+        self.snapshot = RateSnapshot(load_offline_rates(offline_path))
+        self.rate_book = RateBook()
+        self._refresh_task = None
+        self._subscribers = set()
+
+    @property
+    def rates(self):
+        return self.snapshot.rates
+
+    @property
+    def currency_symbols(self):
+        return self.snapshot.currency_symbols
+
+    @property
+    def last_update(self):
+        return self.snapshot.last_update
+
+    @property
+    def last_delta(self):
+        return self.rate_book.last_delta
+
+    def currencies(self):
+        """Sorted currency names in the current snapshot"""
+        return sorted(self.snapshot.rates.keys())
+
+    def convert(self, amount, from_currency, to_currency):
+        """Convert against the current snapshot without blocking"""
+        return self.snapshot.convert(amount, from_currency, to_currency)
+
+    def convert_formatted(self, amount, from_currency, to_currency):
+        """Convert and format with the target currency's precision and symbol"""
+        return format_amount(self.convert(amount, from_currency, to_currency), to_currency)
+
+    async def refresh(self):
+        """Fetch and apply live rates.
+
+        Returns True when the feed was fetched and applied, even if no rate
+        moved (stream subscribers are only notified when something changed),
+        and False when the fetch or parse failed and the old rates were kept.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._do_refresh())
+        return await asyncio.shield(self._refresh_task)
+
+    async def _do_refresh(self):
+        loop = asyncio.get_running_loop()
+        try:
+            delta, snapshot = await loop.run_in_executor(None, self._fetch_and_apply)
+        except Exception as e:
+            print(f"❌ Error fetching rates: {e}")
+            return False
+
+        self.snapshot = snapshot
+        if delta.count:
+            self._notify(snapshot)
+        print(f"✅ Applied {delta.count} rate changes ({len(snapshot.rates)} live currency rates)")
+        return True
+
+    def _fetch_and_apply(self):
+        delta = self.rate_book.apply(self.fetcher(self.url, self.timeout))
+        return delta, self.rate_book.snapshot
+
+    def _notify(self, snapshot):
+        """Hand a new snapshot to every stream subscriber"""
+        for queue in self._subscribers:
+            # Subscribers only care about the newest rates, so drop any stale one
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    async def stream_updates(self):
+        """Yield each snapshot whose rates changed, as refreshes publish it (``async for``)"""
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def auto_refresh(self, interval=1800):
+        """Refresh forever, every ``interval`` seconds (30 minutes by default)"""
+        while True:
+            await self.refresh()
+            await asyncio.sleep(interval)
+
+
+async def _demo():
+    converter = AsyncCurrencyConverter()
+    await converter.refresh()
+
+    # Thousands of concurrent lookups share one snapshot and no threads
+    async def lookup(amount):
+        return converter.convert(amount, 'Indian Rupee', 'US Dollar')
+
+    results = await asyncio.gather(*(lookup(amount) for amount in range(1, 5001)))
+    print(f"💱 1000 INR = {converter.convert(1000, 'Indian Rupee', 'US Dollar'):.4f} USD "
+          f"({len(results)} concurrent conversions)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
@@ -0,0 +1,93 @@
+"""Benchmark full-rebuild vs streaming delta ingest on synthetic rate feeds"""
+import argparse
+import json
+import random
+import time
+
+from rate_ingest import RateBook, iter_rate_items
+
+
+def synthetic_instruments(count):
+    """Instrument map shaped like CURRENCY_MAP with ``count`` codes plus INR/USD"""
+    instruments = {
+        'INR': {'name': 'Indian Rupee', 'symbol': '₹'},
+        'USD': {'name': 'US Dollar', 'symbol': '$'},
+    }
+    for i in range(count):
+        code = f"X{i:05d}"
+        instruments[code] = {'name': f"Instrument {i}", 'symbol': code}
+    return instruments
+
+
+def synthetic_payload(instruments, rng):
+    rates = {code: round(rng.uniform(0.001, 1000), 6) for code in instruments}
+    rates['USD'] = 1
+    rates['INR'] = 83.0
+    return {'base': 'USD', 'date': '2026-01-01', 'rates': rates}
+
+
+def drift(payload, fraction, rng):
+    """Move ``fraction`` of the rates by a small random amount.
+
+    INR always moves too, as it does on essentially every real refresh.
+    """
+    rates = dict(payload['rates'])
+    codes = [code for code in rates if code not in ('INR', 'USD')]
+    for code in rng.sample(codes, max(1, int(len(codes) * fraction))) + ['INR']:
+        rates[code] = round(rates[code] * rng.uniform(0.99, 1.01), 6)
+    return dict(payload, rates=rates)
+
+
+def chunked(text, size=16384):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def timed(func, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--instruments', type=int, default=10000)
+    parser.add_argument('--drift', type=float, default=0.01, help="fraction of rates that move per refresh")
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    instruments = synthetic_instruments(args.instruments)
+    base = synthetic_payload(instruments, rng)
+    moved = drift(base, args.drift, rng)
+    base_chunks = chunked(json.dumps(base))
+    moved_chunks = chunked(json.dumps(moved))
+    text = b''.join(moved_chunks).decode('utf-8')
+
+    def full_rebuild():
+        data = json.loads(text)
+        RateBook(instruments).apply(data['rates'].items())
+
+    book = RateBook(instruments)
+
+    def delta_apply():
+        # Alternate between the two feeds so every round has real changes
+        book.apply(iter_rate_items(base_chunks))
+        return book.apply(iter_rate_items(moved_chunks))
+
+    book.apply(iter_rate_items(base_chunks))
+    delta = delta_apply()
+
+    full = timed(full_rebuild, args.rounds)
+    incremental = timed(delta_apply, args.rounds) / 2
+
+    print(f"📊 {len(instruments)} instruments, {delta.count} rate entries rewritten per refresh ({delta!r})")
+    print(f"   full rebuild (json.loads + rebuild): {full * 1000:8.2f} ms")
+    print(f"   streaming parse + delta apply:      {incremental * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Shared currency data and rate handling used by the GUI and service clients"""
+from datetime import datetime
+
+RATES_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+BASE_CURRENCY = 'Indian Rupee'
+
+# Comprehensive currency mapping with full names and symbols
+CURRENCY_MAP = {
+    'AED': {'name': 'UAE Dirham', 'symbol': 'د.إ'},
+    'AFN': {'name': 'Afghan Afghani', 'symbol': '؋'},
+    'ALL': {'name': 'Albanian Lek', 'symbol': 'L'},
+    'AMD': {'name': 'Armenian Dram', 'symbol': '֏'},
+    'ANG': {'name': 'Netherlands Antillean Guilder', 'symbol': 'ƒ'},
+    'AOA': {'name': 'Angolan Kwanza', 'symbol': 'Kz'},
+    'ARS': {'name': 'Argentine Peso', 'symbol': '$'},
+    'AUD': {'name': 'Australian Dollar', 'symbol': 'A$'},
+    'AWG': {'name': 'Aruban Florin', 'symbol': 'ƒ'},
+    'AZN': {'name': 'Azerbaijani Manat', 'symbol': '₼'},
+    'BAM': {'name': 'Bosnia-Herzegovina Convertible Mark', 'symbol': 'KM'},
+    'BBD': {'name': 'Barbadian Dollar', 'symbol': '$'},
+    'BDT': {'name': 'Bangladeshi Taka', 'symbol': '৳'},
+    'BGN': {'name': 'Bulgarian Lev', 'symbol': 'лв'},
+    'BHD': {'name': 'Bahraini Dinar', 'symbol': '.د.ب'},
+    'BIF': {'name': 'Burundian Franc', 'symbol': 'FBu'},
+    'BMD': {'name': 'Bermudan Dollar', 'symbol': '$'},
+    'BND': {'name': 'Brunei Dollar', 'symbol': '$'},
+    'BOB': {'name': 'Bolivian Boliviano', 'symbol': 'Bs.'},
+    'BRL': {'name': 'Brazilian Real', 'symbol': 'R$'},
+    'BSD': {'name': 'Bahamian Dollar', 'symbol': '$'},
+    'BTC': {'name': 'Bitcoin', 'symbol': '₿'},
+    'BTN': {'name': 'Bhutanese Ngultrum', 'symbol': 'Nu.'},
+    'BWP': {'name': 'Botswanan Pula', 'symbol': 'P'},
+    'BYN': {'name': 'New Belarusian Ruble', 'symbol': 'Br'},
+    'BZD': {'name': 'Belize Dollar', 'symbol': 'BZ$'},
+    'CAD': {'name': 'Canadian Dollar', 'symbol': 'C$'},
+    'CDF': {'name': 'Congolese Franc', 'symbol': 'FC'},
+    'CHF': {'name': 'Swiss Franc', 'symbol': 'CHF'},
+    'CLP': {'name': 'Chilean Peso', 'symbol': '$'},
+    'CNY': {'name': 'Chinese Yuan', 'symbol': '¥'},
+    'COP': {'name': 'Colombian Peso', 'symbol': '$'},
+    'CRC': {'name': 'Costa Rican Colón', 'symbol': '₡'},
+    'CUC': {'name': 'Cuban Convertible Peso', 'symbol': '$'},
+    'CUP': {'name': 'Cuban Peso', 'symbol': '₱'},
+    'CVE': {'name': 'Cape Verdean Escudo', 'symbol': '$'},
+    'CZK': {'name': 'Czech Republic Koruna', 'symbol': 'Kč'},
+    'DJF': {'name': 'Djiboutian Franc', 'symbol': 'Fdj'},
+    'DKK': {'name': 'Danish Krone', 'symbol': 'kr'},
+    'DOP': {'name': 'Dominican Peso', 'symbol': 'RD$'},
+    'DZD': {'name': 'Algerian Dinar', 'symbol': 'دج'},
+    'EGP': {'name': 'Egyptian Pound', 'symbol': '£'},
+    'ERN': {'name': 'Eritrean Nakfa', 'symbol': 'Nfk'},
+    'ETB': {'name': 'Ethiopian Birr', 'symbol': 'Br'},
+    'EUR': {'name': 'Euro', 'symbol': '€'},
+    'FJD': {'name': 'Fijian Dollar', 'symbol': '$'},
+    'FKP': {'name': 'Falkland Islands Pound', 'symbol': '£'},
+    'GBP': {'name': 'British Pound Sterling', 'symbol': '£'},
+    'GEL': {'name': 'Georgian Lari', 'symbol': '₾'},
+    'GGP': {'name': 'Guernsey Pound', 'symbol': '£'},
+    'GHS': {'name': 'Ghanaian Cedi', 'symbol': '¢'},
+    'GIP': {'name': 'Gibraltar Pound', 'symbol': '£'},
+    'GMD': {'name': 'Gambian Dalasi', 'symbol': 'D'},
+    'GNF': {'name': 'Guinean Franc', 'symbol': 'FG'},
+    'GTQ': {'name': 'Guatemalan Quetzal', 'symbol': 'Q'},
+    'GYD': {'name': 'Guyanaese Dollar', 'symbol': '$'},
+    'HKD': {'name': 'Hong Kong Dollar', 'symbol': 'HK$'},
+    'HNL': {'name': 'Honduran Lempira', 'symbol': 'L'},
+    'HRK': {'name': 'Croatian Kuna', 'symbol': 'kn'},
+    'HTG': {'name': 'Haitian Gourde', 'symbol': 'G'},
+    'HUF': {'name': 'Hungarian Forint', 'symbol': 'Ft'},
+    'IDR': {'name': 'Indonesian Rupiah', 'symbol': 'Rp'},
+    'ILS': {'name': 'Israeli New Sheqel', 'symbol': '₪'},
+    'IMP': {'name': 'Manx pound', 'symbol': '£'},
+    'INR': {'name': 'Indian Rupee', 'symbol': '₹'},
+    'IQD': {'name': 'Iraqi Dinar', 'symbol': 'ع.د'},
+    'IRR': {'name': 'Iranian Rial', 'symbol': '﷼'},
+    'ISK': {'name': 'Icelandic Króna', 'symbol': 'kr'},
+    'JEP': {'name': 'Jersey Pound', 'symbol': '£'},
+    'JMD': {'name': 'Jamaican Dollar', 'symbol': 'J$'},
+    'JOD': {'name': 'Jordanian Dinar', 'symbol': 'JD'},
+    'JPY': {'name': 'Japanese Yen', 'symbol': '¥'},
+    'KES': {'name': 'Kenyan Shilling', 'symbol': 'KSh'},
+    'KGS': {'name': 'Kyrgystani Som', 'symbol': 'лв'},
+    'KHR': {'name': 'Cambodian Riel', 'symbol': '៛'},
+    'KMF': {'name': 'Comorian Franc', 'symbol': 'CF'},
+    'KPW': {'name': 'North Korean Won', 'symbol': '₩'},
+    'KRW': {'name': 'South Korean Won', 'symbol': '₩'},
+    'KWD': {'name': 'Kuwaiti Dinar', 'symbol': 'KD'},
+    'KYD': {'name': 'Cayman Islands Dollar', 'symbol': '$'},
+    'KZT': {'name': 'Kazakhstani Tenge', 'symbol': '₸'},
+    'LAK': {'name': 'Laotian Kip', 'symbol': '₭'},
+    'LBP': {'name': 'Lebanese Pound', 'symbol': '£'},
+    'LKR': {'name': 'Sri Lankan Rupee', 'symbol': '₨'},
+    'LRD': {'name': 'Liberian Dollar', 'symbol': '$'},
+    'LSL': {'name': 'Lesotho Loti', 'symbol': 'M'},
+    'LYD': {'name': 'Libyan Dinar', 'symbol': 'LD'},
+    'MAD': {'name': 'Moroccan Dirham', 'symbol': 'MAD'},
+    'MDL': {'name': 'Moldovan Leu', 'symbol': 'lei'},
+    'MGA': {'name': 'Malagasy Ariary', 'symbol': 'Ar'},
+    'MKD': {'name': 'Macedonian Denar', 'symbol': 'ден'},
+    'MMK': {'name': 'Myanma Kyat', 'symbol': 'K'},
+    'MNT': {'name': 'Mongolian Tugrik', 'symbol': '₮'},
+    'MOP': {'name': 'Macanese Pataca', 'symbol': 'MOP$'},
+    'MRO': {'name': 'Mauritanian Ouguiya', 'symbol': 'UM'},
+    'MRU': {'name': 'Mauritanian Ouguiya', 'symbol': 'UM'},
+    'MUR': {'name': 'Mauritian Rupee', 'symbol': '₨'},
+    'MVR': {'name': 'Maldivian Rufiyaa', 'symbol': 'Rf'},
+    'MWK': {'name': 'Malawian Kwacha', 'symbol': 'MK'},
+    'MXN': {'name': 'Mexican Peso', 'symbol': '$'},
+    'MYR': {'name': 'Malaysian Ringgit', 'symbol': 'RM'},
+    'MZN': {'name': 'Mozambican Metical', 'symbol': 'MT'},
+    'NAD': {'name': 'Namibian Dollar', 'symbol': '$'},
+    'NGN': {'name': 'Nigerian Naira', 'symbol': '₦'},
+    'NIO': {'name': 'Nicaraguan Córdoba', 'symbol': 'C$'},
+    'NOK': {'name': 'Norwegian Krone', 'symbol': 'kr'},
+    'NPR': {'name': 'Nepalese Rupee', 'symbol': '₨'},
+    'NZD': {'name': 'New Zealand Dollar', 'symbol': 'NZ$'},
+    'OMR': {'name': 'Omani Rial', 'symbol': '﷼'},
+    'PAB': {'name': 'Panamanian Balboa', 'symbol': 'B/.'},
+    'PEN': {'name': 'Peruvian Nuevo Sol', 'symbol': 'S/.'},
+    'PGK': {'name': 'Papua New Guinean Kina', 'symbol': 'K'},
+    'PHP': {'name': 'Philippine Peso', 'symbol': '₱'},
+    'PKR': {'name': 'Pakistani Rupee', 'symbol': '₨'},
+    'PLN': {'name': 'Polish Zloty', 'symbol': 'zł'},
+    'PYG': {'name': 'Paraguayan Guarani', 'symbol': 'Gs'},
+    'QAR': {'name': 'Qatari Rial', 'symbol': '﷼'},
+    'RON': {'name': 'Romanian Leu', 'symbol': 'lei'},
+    'RSD': {'name': 'Serbian Dinar', 'symbol': 'Дин.'},
+    'RUB': {'name': 'Russian Ruble', 'symbol': '₽'},
+    'RWF': {'name': 'Rwandan Franc', 'symbol': 'R₣'},
+    'SAR': {'name': 'Saudi Riyal', 'symbol': '﷼'},
+    'SBD': {'name': 'Solomon Islands Dollar', 'symbol': '$'},
+    'SCR': {'name': 'Seychellois Rupee', 'symbol': '₨'},
+    'SDG': {'name': 'Sudanese Pound', 'symbol': 'ج.س.'},
+    'SEK': {'name': 'Swedish Krona', 'symbol': 'kr'},
+    'SGD': {'name': 'Singapore Dollar', 'symbol': 'S$'},
+    'SHP': {'name': 'Saint Helena Pound', 'symbol': '£'},
+    'SLE': {'name': 'Sierra Leonean Leone', 'symbol': 'Le'},
+    'SLL': {'name': 'Sierra Leonean Leone', 'symbol': 'Le'},
+    'SOS': {'name': 'Somali Shilling', 'symbol': 'S'},
+    'SRD': {'name': 'Surinamese Dollar', 'symbol': '$'},
+    'STD': {'name': 'São Tomé and Príncipe Dobra', 'symbol': 'Db'},
+    'STN': {'name': 'São Tomé and Príncipe Dobra', 'symbol': 'Db'},
+    'SVC': {'name': 'Salvadoran Colón', 'symbol': '$'},
+    'SYP': {'name': 'Syrian Pound', 'symbol': '£'},
+    'SZL': {'name': 'Swazi Lilangeni', 'symbol': 'E'},
+    'THB': {'name': 'Thai Baht', 'symbol': '฿'},
+    'TJS': {'name': 'Tajikistani Somoni', 'symbol': 'SM'},
+    'TMT': {'name': 'Turkmenistani Manat', 'symbol': 'T'},
+    'TND': {'name': 'Tunisian Dinar', 'symbol': 'د.ت'},
+    'TOP': {'name': 'Tongan Paʻanga', 'symbol': 'T$'},
+    'TRY': {'name': 'Turkish Lira', 'symbol': '₺'},
+    'TTD': {'name': 'Trinidad and Tobago Dollar', 'symbol': 'TT$'},
+    'TWD': {'name': 'New Taiwan Dollar', 'symbol': 'NT$'},
+    'TZS': {'name': 'Tanzanian Shilling', 'symbol': 'TSh'},
+    'UAH': {'name': 'Ukrainian Hryvnia', 'symbol': '₴'},
+    'UGX': {'name': 'Ugandan Shilling', 'symbol': 'USh'},
+    'USD': {'name': 'US Dollar', 'symbol': '$'},
+    'UYU': {'name': 'Uruguayan Peso', 'symbol': '$U'},
+    'UZS': {'name': 'Uzbekistan Som', 'symbol': 'лв'},
+    'VED': {'name': 'Venezuelan Bolívar', 'symbol': 'Bs'},
+    'VES': {'name': 'Venezuelan Bolívar', 'symbol': 'Bs'},
+    'VND': {'name': 'Vietnamese Dong', 'symbol': '₫'},
+    'VUV': {'name': 'Vanuatu Vatu', 'symbol': 'VT'},
+    'WST': {'name': 'Samoan Tala', 'symbol': 'WS$'},
+    'XAF': {'name': 'CFA Franc BEAC', 'symbol': 'FCFA'},
+    'XAG': {'name': 'Silver (troy ounce)', 'symbol': 'XAG'},
+    'XAU': {'name': 'Gold (troy ounce)', 'symbol': 'XAU'},
+    'XCD': {'name': 'East Caribbean Dollar', 'symbol': '$'},
+    'XDR': {'name': 'Special Drawing Rights', 'symbol': 'SDR'},
+    'XOF': {'name': 'CFA Franc BCEAO', 'symbol': 'CFA'},
+    'XPD': {'name': 'Palladium Ounce', 'symbol': 'XPD'},
+    'XPF': {'name': 'CFP Franc', 'symbol': '₣'},
+    'XPT': {'name': 'Platinum Ounce', 'symbol': 'XPT'},
+    'YER': {'name': 'Yemeni Rial', 'symbol': '﷼'},
+    'ZAR': {'name': 'South African Rand', 'symbol': 'R'},
+    'ZMW': {'name': 'Zambian Kwacha', 'symbol': 'ZK'},
+    'ZWL': {'name': 'Zimbabwean Dollar', 'symbol': 'Z$'},
+}
+
+# Names used by currencyData.txt that differ from the API names above
+OFFLINE_NAME_CODES = {
+    'Botswana Pula': 'BWP',
+    'British Pound': 'GBP',
+    'Bruneian Dollar': 'BND',
+    'Chinese Yuan Renminbi': 'CNY',
+    'Czech Koruna': 'CZK',
+    'Emirati Dirham': 'AED',
+    'Icelandic Krona': 'ISK',
+    'Israeli Shekel': 'ILS',
+    'Qatari Riyal': 'QAR',
+    'Romanian New Leu': 'RON',
+    'Saudi Arabian Riyal': 'SAR',
+    'Taiwan New Dollar': 'TWD',
+    'Trinidadian Dollar': 'TTD',
+    'Venezuelan Bolivar': 'VES',
+}
+
+CODE_BY_NAME = dict(OFFLINE_NAME_CODES)
+for _code, _info in CURRENCY_MAP.items():
+    CODE_BY_NAME.setdefault(_info['name'], _code)
+
+OFFLINE_FALLBACK_RATES = {
+    'Indian Rupee': 1.0,
+    'US Dollar': 0.013588,
+    'Euro': 0.011175,
+    'British Pound': 0.010200,
+    'Japanese Yen': 1.413723
+}
+
+
+def load_offline_rates(path='currencyData.txt'):
+    """Load offline currency data"""
+    rates = {}
+    try:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+        
+        for line in lines:
+            try:
+                parts = line.strip().split('\t')
+                if len(parts) >= 2:
+                    currency = parts[0]
+                    rate = float(parts[1])
+                    rates[currency] = rate
+            except:
+                continue
+        
+        rates[BASE_CURRENCY] = 1.0
+        
+    except FileNotFoundError:
+        rates = dict(OFFLINE_FALLBACK_RATES)
+    
+    return rates
+
+
+def currency_code(currency):
+    """Return the ISO code for a currency name (or code), or None if unknown"""
+    if currency in CURRENCY_MAP:
+        return currency
+    return CODE_BY_NAME.get(currency)
+
+
+def convert_amount(rates, amount, from_currency, to_currency):
+    """Convert an amount between two currencies.
+
+    Rates are units per one unit of a reference currency (INR for the
+    offline table, USD for live rates); only their ratio is used, so the
+    reference currency never matters.
+    """
+    if from_currency == to_currency:
+        return amount
+    
+    return amount / rates.get(from_currency, 1) * rates.get(to_currency, 1)
+
+
+class RateSnapshot:
+    """Immutable view of one set of rates, swapped in whole on every refresh"""
+    
+    __slots__ = ('rates', 'currency_symbols', 'last_update', 'live')
+    
+    def __init__(self, rates, currency_symbols=None, last_update=None, live=False):
+        self.rates = rates
+        self.currency_symbols = currency_symbols or {}
+        self.last_update = last_update or datetime.now()
+        self.live = live
+    
+    def convert(self, amount, from_currency, to_currency):
+        """Convert using the rates held by this snapshot"""
+        return convert_amount(self.rates, amount, from_currency, to_currency)
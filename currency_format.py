@@ -0,0 +1,180 @@
+"""Per-currency amount formatting with precompiled formatters"""
+import math
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+
+from currency_data import CURRENCY_MAP, currency_code
+
+DEFAULT_MINOR_UNITS = 2
+SUB_UNIT_DECIMALS = 6
+
+# ISO 4217 minor units where they differ from the default of 2
+MINOR_UNITS = {
+    'BIF': 0, 'CLP': 0, 'DJF': 0, 'GNF': 0, 'ISK': 0, 'JPY': 0, 'KMF': 0,
+    'KRW': 0, 'PYG': 0, 'RWF': 0, 'UGX': 0, 'VND': 0, 'VUV': 0, 'XAF': 0,
+    'XOF': 0, 'XPF': 0,
+    'BHD': 3, 'IQD': 3, 'JOD': 3, 'KWD': 3, 'LYD': 3, 'OMR': 3, 'TND': 3,
+    # No ISO minor unit; quoted per troy ounce / unit
+    'XAU': 4, 'XAG': 4, 'XPD': 4, 'XPT': 4, 'XDR': 4,
+    'BTC': 8,
+}
+
+# Currencies conventionally written with the symbol after the amount
+SYMBOL_AFTER = {'BGN', 'CZK', 'DKK', 'HUF', 'ISK', 'MDL', 'NOK', 'PLN', 'RON', 'SEK', 'VND'}
+
+# Currencies grouped in lakhs/crores (12,34,567.00)
+INDIAN_GROUPING = {'BDT', 'INR', 'NPR'}
+INDIAN_GROUPING_FROM = 99999
+
+
+def group_indian(digits):
+    """Group an unsigned integer string as 12,34,567"""
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    if len(head) <= 2:
+        return head + ',' + tail
+    first = len(head) % 2 or 2
+    groups = [head[:first]]
+    groups += [head[i:i + 2] for i in range(first, len(head), 2)]
+    return ','.join(groups) + ',' + tail
+
+
+class CurrencyFormatter:
+    """Formatter for one currency, with its templates built once up front.
+
+    Amounts are rounded half-up to the currency's minor units. Pass
+    ``fine=True`` to keep extra precision on sub-unit values (e.g. for rate
+    display), where ``¥0.9999`` is more useful than ``¥1``.
+    """
+
+    __slots__ = ('code', 'symbol', 'minor_units', 'symbol_after', 'indian_grouping',
+                 '_wrap', '_wrap_negative', '_number', '_western', '_plain', '_frac_width', '_scale', '_quantum', '_fine')
+
+    def __init__(self, code=None, symbol='', minor_units=DEFAULT_MINOR_UNITS,
+                 symbol_after=False, indian_grouping=False):
+        self.code = code
+        self.symbol = symbol
+        self.minor_units = minor_units
+        self.symbol_after = symbol_after
+        self.indian_grouping = indian_grouping
+
+        if not symbol:
+            template = '{}'
+        elif symbol_after:
+            template = '{} ' + symbol.replace('{', '{{').replace('}', '}}')
+        else:
+            template = symbol.replace('{', '{{').replace('}', '}}') + '{}'
+
+        self._wrap = template.format
+        self._wrap_negative = ('-' + template).format
+        # Number and symbol in a single format call for the common case
+        self._western = template.replace('{}', '{:,.%df}' % minor_units, 1).format
+        self._number = self._number_indian if indian_grouping else self._western
+        self._plain = '{:.%df}' % minor_units
+        self._frac_width = minor_units + 1 if minor_units else 0
+        self._scale = 10 ** minor_units
+        self._quantum = Decimal(1).scaleb(-minor_units)
+        self._fine = '{:.%df}' % max(SUB_UNIT_DECIMALS, minor_units)
+
+    def format(self, value, fine=False):
+        """Format one amount"""
+        if not fine:
+            # str.format rounds exact ties half-to-even and prints -0.0 with a sign,
+            # so ties and zeros take the slow path
+            if value > 0:
+                if (value * self._scale) % 1 != 0.5:
+                    return self._number(value)
+            elif value <= -1 and (-value * self._scale) % 1 != 0.5:
+                return '-' + self._number(-value)
+        return self._format_slow(value, fine)
+
+    def format_many(self, values, fine=False):
+        """Format a batch of amounts, avoiding per-value dispatch where possible"""
+        slow = self._format_slow
+        if fine:
+            return [slow(value, fine) for value in values]
+
+        number = self._number
+        scale = self._scale
+        return [number(value) if value > 0 and (value * scale) % 1 != 0.5
+                else '-' + number(-value) if value <= -1 and (-value * scale) % 1 != 0.5
+                else slow(value)
+                for value in values]
+
+    def _number_indian(self, value):
+        # Below a lakh the two groupings agree, even after rounding up
+        if value < INDIAN_GROUPING_FROM:
+            return self._western(value)
+        text = self._plain.format(value)
+        cut = len(text) - self._frac_width
+        whole = text[:cut]
+        if 5 < cut < 8:
+            # Lakhs, the common case, without the general regrouping loop
+            whole = whole[:-5] + ',' + whole[-5:-3] + ',' + whole[-3:]
+        else:
+            whole = group_indian(whole)
+        return self._wrap(whole + text[cut:])
+
+    def _format_slow(self, value, fine=False):
+        if not math.isfinite(value):
+            return self._wrap(str(value))
+
+        negative = value < 0
+        magnitude = abs(value)
+
+        if fine and 0 < magnitude < 1:
+            # Keep precision on sub-unit amounts, but never below the minor units
+            whole, frac = self._fine.format(magnitude).split('.')
+            frac = frac.rstrip('0').ljust(self.minor_units, '0')
+            text = f"{whole}.{frac}" if frac else whole
+        else:
+            exact = Decimal(magnitude)
+            with localcontext() as context:
+                # The default 28 digits cannot hold every digit of a huge float
+                context.prec = max(context.prec, exact.adjusted() + self.minor_units + 2)
+                rounded = exact.quantize(self._quantum, ROUND_HALF_UP)
+            negative = negative and rounded != 0
+            if self.indian_grouping:
+                whole, _, frac = '{:f}'.format(rounded).partition('.')
+                text = group_indian(whole) + ('.' + frac if frac else '')
+            else:
+                text = '{:,f}'.format(rounded)
+
+        if negative:
+            return self._wrap_negative(text)
+        return self._wrap(text)
+
+
+# One formatter per ISO code, plus a shared one for anything unrecognised
+_FORMATTERS = {}
+_DEFAULT_FORMATTER = CurrencyFormatter()
+
+
+def build_formatter(code):
+    """Build the formatter for an ISO code"""
+    return CurrencyFormatter(code=code,
+                             symbol=CURRENCY_MAP[code]['symbol'],
+                             minor_units=MINOR_UNITS.get(code, DEFAULT_MINOR_UNITS),
+                             symbol_after=code in SYMBOL_AFTER,
+                             indian_grouping=code in INDIAN_GROUPING)
+
+
+def get_formatter(currency):
+    """Return the cached formatter for a currency name or ISO code"""
+    code = currency_code(currency)
+    if code is None:
+        return _DEFAULT_FORMATTER
+    formatter = _FORMATTERS.get(code)
+    if formatter is None:
+        formatter = _FORMATTERS[code] = build_formatter(code)
+    return formatter
+
+
+def format_amount(value, currency, fine=False):
+    """Format one amount in the given currency"""
+    return get_formatter(currency).format(value, fine)
+
+
+def format_amounts(values, currency, fine=False):
+    """Format many amounts in the given currency"""
+    return get_formatter(currency).format_many(values, fine)
@@ -0,0 +1,183 @@
+"""Streaming rate-feed parser and incremental (delta) rate application"""
+import codecs
+import itertools
+import json
+import re
+import threading
+from datetime import datetime
+
+import requests
+
+from currency_data import BASE_CURRENCY, CURRENCY_MAP, RATES_URL, RateSnapshot
+
+_RATES_KEY = re.compile(r'"rates"\s*:\s*\{')
+
+
+def _decode_pairs(text):
+    """Decode a run of complete "CODE": rate pairs with the C JSON decoder"""
+    if not text.strip():
+        return ()
+    return json.loads('{' + text + '}').items()
+
+
+def iter_rate_items(chunks):
+    """Yield (code, usd_rate) pairs from the payload's "rates" object as chunks arrive.
+
+    Chunks may be bytes or str. Each chunk's run of complete pairs (up to its
+    last comma) is decoded as soon as it arrives, so the full payload is never
+    held or parsed as one document. Raises ValueError if the payload is
+    malformed or ends before the rates object is closed, so a truncated feed
+    is never half-applied.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = None  # Offset into buffer once inside the rates object
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        buffer += chunk
+
+        if pos is None:
+            match = _RATES_KEY.search(buffer)
+            if match is None:
+                # Keep a tail in case the key is split across chunks
+                buffer = buffer[-32:]
+                continue
+            pos = match.end()
+
+        # Rate values are plain numbers, so the first '}' closes the object
+        end = buffer.find('}', pos)
+        if end != -1:
+            yield from _decode_pairs(buffer[pos:end])
+            return
+
+        cut = buffer.rfind(',', pos)
+        if cut != -1:
+            yield from _decode_pairs(buffer[pos:cut])
+            pos = cut + 1
+        buffer = buffer[pos:]
+        pos = 0
+
+    if pos is None:
+        raise ValueError("No 'rates' object in payload")
+    raise ValueError("Truncated 'rates' object in payload")
+
+
+def fetch_rate_items(url=RATES_URL, timeout=15, chunk_size=16384):
+    """Stream (code, usd_rate) pairs straight from the API response"""
+    with requests.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        yield from iter_rate_items(response.iter_content(chunk_size=chunk_size))
+
+
+class RateDelta:
+    """What one refresh changed"""
+
+    __slots__ = ('changed', 'added', 'removed')
+
+    def __init__(self, changed=0, added=0, removed=0):
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+
+    @property
+    def count(self):
+        """Number of currency entries rewritten in the rate table"""
+        return self.changed + self.added + self.removed
+
+    @property
+    def names_changed(self):
+        """True when currencies were added or removed (GUI lists need rebuilding)"""
+        return bool(self.added or self.removed)
+
+    def __repr__(self):
+        return f"RateDelta(changed={self.changed}, added={self.added}, removed={self.removed})"
+
+
+class RateBook:
+    """Keeps the last applied USD rates and turns each feed into a delta.
+
+    The rate table is kept in USD terms (units per US Dollar) and conversions
+    only use ratios, so a move in any one rate, INR included, rewrites just
+    that entry; everything else is carried over from the previous snapshot.
+    """
+
+    def __init__(self, instruments=CURRENCY_MAP):
+        self.instruments = instruments
+        # Codes sharing a display name (e.g. MRO/MRU); later codes are preferred
+        self._codes_by_name = {}
+        for code, info in instruments.items():
+            self._codes_by_name.setdefault(info['name'], []).insert(0, code)
+        self.usd_rates = {}
+        self.snapshot = None
+        self.last_delta = None
+        self._lock = threading.Lock()
+
+    def apply(self, items):
+        """Apply a feed of (code, usd_rate) pairs and return the RateDelta"""
+        with self._lock:
+            return self._apply(items)
+
+    def _apply(self, items):
+        instruments = self.instruments
+        usd_rates = self.usd_rates
+        updates = {}
+        seen = set()
+
+        # Consume the whole feed before touching any state
+        for code, usd_rate in items:
+            if code not in instruments or usd_rate <= 0:
+                continue
+            seen.add(code)
+            if usd_rates.get(code) != usd_rate:
+                updates[code] = usd_rate
+        if not seen:
+            raise ValueError("Rate feed contained no known currencies")
+        removed = [code for code in usd_rates if code not in seen]
+
+        usd_rates.update(updates)
+        for code in removed:
+            del usd_rates[code]
+
+        previous = self.snapshot
+        if previous is None:
+            rates, currency_symbols = {}, {}
+        elif updates or removed:
+            rates, currency_symbols = dict(previous.rates), dict(previous.currency_symbols)
+        else:
+            rates, currency_symbols = previous.rates, previous.currency_symbols
+
+        delta = RateDelta()
+        names = {instruments[code]['name'] for code in itertools.chain(updates, removed)}
+        if previous is None:
+            names.add(BASE_CURRENCY)
+        for name in names:
+            rate, symbol = self._resolve(name)
+            if rate is None:
+                if rates.pop(name, None) is not None:
+                    currency_symbols.pop(name, None)
+                    delta.removed += 1
+            elif name not in rates:
+                rates[name] = rate
+                currency_symbols[name] = symbol
+                delta.added += 1
+            elif rates[name] != rate:
+                rates[name] = rate
+                currency_symbols[name] = symbol
+                delta.changed += 1
+
+        self.snapshot = RateSnapshot(rates, currency_symbols, datetime.now(), live=True)
+        self.last_delta = delta
+        return delta
+
+    def _resolve(self, name):
+        """Rate and symbol for a display name from whichever of its codes is still live"""
+        for code in self._codes_by_name.get(name, ()):
+            rate = self.usd_rates.get(code)
+            if rate is not None:
+                return rate, self.instruments[code]['symbol']
+        # The base currency is always available
+        if name == BASE_CURRENCY:
+            return 83.0, '₹'  # Fallback rate
+        return None, None
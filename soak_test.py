@@ -0,0 +1,368 @@
+"""Load and soak test: concurrent conversions while rates refresh from a local stub"""
+import argparse
+import asyncio
+import collections
+import heapq
+import itertools
+import random
+import threading
+import time
+import tracemalloc
+
+from async_converter import AsyncCurrencyConverter
+from Compact_Modern_Converter import CompactModernConverter
+from currency_format import format_amount
+from stub_rate_provider import StubRateProvider
+
+MAX_LATENCY_SAMPLES = 200000
+
+
+class SoakStats:
+    """Counters for one report interval plus running totals"""
+
+    def __init__(self):
+        self.total_ops = 0
+        self.ops = 0
+        self.latencies = []
+        self.loop_lags = []
+        self.refresh_ok = 0
+        self.refresh_failed = 0
+        self.refresh_seconds = 0.0
+        self.async_checks = 0
+        self.async_torn = 0
+        self.gui_checks = 0
+        self.gui_torn = 0
+        self.gui_raced = 0
+        self.gui_fetches = 0
+
+    def record(self, latency):
+        self.ops += 1
+        if len(self.latencies) < MAX_LATENCY_SAMPLES:
+            self.latencies.append(latency)
+        else:
+            # Reservoir sample so long intervals don't grow memory
+            slot = random.randrange(self.ops)
+            if slot < MAX_LATENCY_SAMPLES:
+                self.latencies[slot] = latency
+
+    def take_interval(self):
+        ops, latencies, loop_lags = self.ops, self.latencies, self.loop_lags
+        self.total_ops += ops
+        self.ops = 0
+        self.latencies = []
+        self.loop_lags = []
+        return ops, latencies, loop_lags
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class _StubWidget:
+    """Records the options a widget was configured with"""
+
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def itemconfig(self, item, **options):
+        self.options.update(options)
+
+    def __getitem__(self, key):
+        return self.options.get(key, '')
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+
+class _StubVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessRoot:
+    """Stands in for ``tk.Tk``: ``after`` queues callbacks for the pump thread to run.
+
+    Every callback is counted when scheduled and when run, so callbacks that
+    pile up faster than they run show up as a growing ``pending`` count.
+    """
+
+    def __init__(self):
+        self.scheduled = 0
+        self.executed = 0
+        self._queue = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def after(self, ms, func, *args):
+        with self._lock:
+            after_id = next(self._ids)
+            heapq.heappush(self._queue, (time.monotonic() + ms / 1000, after_id, func, args))
+            self.scheduled += 1
+        return f"after#{after_id}"
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    def run_due(self):
+        """Run every callback that is due, as one pass of the Tk event loop would"""
+        while True:
+            with self._lock:
+                if not self._queue or self._queue[0][0] > time.monotonic():
+                    return
+                _, _, func, args = heapq.heappop(self._queue)
+                self.executed += 1
+            func(*args)
+
+
+class HeadlessConverter(CompactModernConverter):
+    """The Tk converter with stub widgets, so its refresh path runs without a display.
+
+    Every snapshot the converter publishes is numbered and kept for a while,
+    so a conversion that raced a refresh can still be checked against each
+    snapshot that was current while it ran.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.published = 0
+        self._history = collections.deque(maxlen=64)
+        self._history_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @snapshot.setter
+    def snapshot(self, snapshot):
+        with self._history_lock:
+            self._snapshot = snapshot
+            self._history.append((self.published, snapshot))
+            self.published += 1
+
+    def published_since(self, number):
+        """Snapshots published as ``number`` or later"""
+        with self._history_lock:
+            return [snapshot for seq, snapshot in self._history if seq >= number and snapshot is not None]
+
+    def create_compact_modern_gui(self):
+        self.root = HeadlessRoot()
+        self.amount_var = _StubVar("1000")
+        self.from_var = _StubVar()
+        self.to_var = _StubVar()
+        for name in ('status_canvas', 'status_label', 'from_combo', 'to_combo', 'swap_btn',
+                     'result_label', 'rate_info_label', 'convert_btn', 'refresh_btn'):
+            setattr(self, name, _StubWidget())
+        self.status_dot = 1
+        self.animate_status_dot()
+        self.setup_initial_currencies()
+
+
+def expected_gui_text(snapshot, amount, from_currency, to_currency):
+    """The result and rate lines ``convert_now`` should show for one snapshot"""
+    result = snapshot.convert(amount, from_currency, to_currency)
+    if from_currency == to_currency:
+        return format_amount(result, to_currency), ""
+    symbols = snapshot.currency_symbols
+    return (format_amount(result, to_currency),
+            f"1 {symbols.get(from_currency, '')} = {result / amount:.4f} {symbols.get(to_currency, '')}")
+
+
+def check_gui_conversion(app, stats, rng):
+    """Run ``convert_now`` and check its output came from a single snapshot.
+
+    The displayed result and rate line must both match one snapshot that was
+    current at some point during the call. When a refresh landed mid-call
+    either the old or the new snapshot is fine, but a mix counts as torn.
+    """
+    currencies = app.from_combo['values']
+    if not currencies:
+        return
+    amount = round(rng.uniform(1, 100000), 2)
+    from_currency, to_currency = rng.choice(currencies), rng.choice(currencies)
+    app.amount_var.set(str(amount))
+    app.from_var.set(from_currency)
+    app.to_var.set(to_currency)
+
+    # The snapshot current on entry has the last number published so far
+    first = app.published - 1
+    app.convert_now()
+    candidates = app.published_since(first)
+
+    shown = (app.result_label['text'], app.rate_info_label['text'])
+    stats.gui_checks += 1
+    stats.gui_raced += len(candidates) > 1
+    stats.gui_torn += not any(shown == expected_gui_text(snapshot, amount, from_currency, to_currency)
+                              for snapshot in candidates)
+
+
+def gui_pump(app, stats, stop, refresh_interval):
+    """Act as the Tk thread: run due callbacks, refresh on a timer and convert in between"""
+    rng = random.Random()
+    next_refresh = time.monotonic() + refresh_interval
+    while not stop.is_set():
+        app.root.run_due()
+        if time.monotonic() >= next_refresh:
+            app.fetch_live_rates()
+            stats.gui_fetches += 1
+            next_refresh += refresh_interval
+        check_gui_conversion(app, stats, rng)
+        time.sleep(0.001)
+
+
+async def conversion_worker(converter, stats, deadline):
+    rng = random.Random()
+    currencies = converter.currencies()
+    count = 0
+    while time.monotonic() < deadline:
+        if count % 1000 == 0:
+            currencies = converter.currencies()
+        amount, from_currency, to_currency = rng.uniform(1, 100000), rng.choice(currencies), rng.choice(currencies)
+        snapshot = converter.snapshot
+        start = time.perf_counter()
+        text = converter.convert_formatted(amount, from_currency, to_currency)
+        stats.record(time.perf_counter() - start)
+        count += 1
+
+        # The result must come from the snapshot read above, and that snapshot's
+        # rates and symbols from the same refresh
+        stats.async_checks += 1
+        stats.async_torn += (text != format_amount(snapshot.convert(amount, from_currency, to_currency), to_currency)
+                             or snapshot.live and (to_currency in snapshot.rates) != (to_currency in snapshot.currency_symbols))
+        # Let the other workers and the refresher run; loop lag is measured separately
+        await asyncio.sleep(0)
+
+
+async def loop_lag_monitor(stats, deadline, interval=0.01):
+    """Record how late the event loop wakes a sleeping task"""
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stats.loop_lags.append(time.perf_counter() - start - interval)
+
+
+async def refresher(converter, stats, deadline, interval):
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        start = time.perf_counter()
+        if await converter.refresh():
+            stats.refresh_ok += 1
+        else:
+            stats.refresh_failed += 1
+        stats.refresh_seconds = max(stats.refresh_seconds, time.perf_counter() - start)
+
+
+def resource_snapshot():
+    current, _ = tracemalloc.get_traced_memory()
+    return {
+        'threads': threading.active_count(),
+        'tasks': len(asyncio.all_tasks()),
+        'memory': current,
+    }
+
+
+def print_report(elapsed, interval, ops, latencies, loop_lags, stats, converter, app, baseline):
+    latencies.sort()
+    loop_lags.sort()
+    now = resource_snapshot()
+    delta = converter.last_delta
+    root = app.root
+    print(f"⏱️ {elapsed:8.0f}s | {ops / interval:10.0f} ops/s | "
+          f"p50 {percentile(latencies, 0.5) * 1e6:6.1f} µs  p99 {percentile(latencies, 0.99) * 1e6:6.1f} µs  "
+          f"p99.9 {percentile(latencies, 0.999) * 1e6:6.1f} µs  max {(latencies[-1] if latencies else 0) * 1e3:7.2f} ms")
+    print(f"   loop lag p50 {percentile(loop_lags, 0.5) * 1e3:6.2f} ms  p99 {percentile(loop_lags, 0.99) * 1e3:6.2f} ms  "
+          f"max {(loop_lags[-1] if loop_lags else 0) * 1e3:7.2f} ms")
+    print(f"   refresh ok {stats.refresh_ok} / failed {stats.refresh_failed} "
+          f"(slowest {stats.refresh_seconds:.2f}s, last delta {delta.count if delta else 0}) | "
+          f"torn {stats.async_torn} of {stats.async_checks} conversions")
+    print(f"   gui fetches {stats.gui_fetches} | after callbacks {root.scheduled} scheduled / {root.executed} run / "
+          f"{root.pending} pending ({root.pending - baseline['pending']:+d}) | "
+          f"torn {stats.gui_torn} of {stats.gui_checks} checks ({stats.gui_raced} raced a refresh)")
+    print(f"   threads {now['threads']} ({now['threads'] - baseline['threads']:+d}) | "
+          f"tasks {now['tasks']} ({now['tasks'] - baseline['tasks']:+d}) | "
+          f"memory {now['memory'] / 1e6:.1f} MB ({(now['memory'] - baseline['memory']) / 1e6:+.1f} MB)")
+
+
+async def run_soak(args):
+    provider = StubRateProvider(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                truncate_rate=args.truncate_rate, drift=args.drift, churn=args.churn,
+                                seed=args.seed).start()
+    converter = AsyncCurrencyConverter(url=provider.url, timeout=args.timeout)
+    stats = SoakStats()
+    stop = threading.Event()
+
+    try:
+        await converter.refresh()
+        # The GUI's own fetch thread and after() callbacks, driven from a stand-in Tk thread
+        app = HeadlessConverter(rates_url=provider.url)
+        tracemalloc.start()
+        deadline = time.monotonic() + args.duration
+
+        pump = threading.Thread(target=gui_pump, args=(app, stats, stop, args.gui_refresh_interval), daemon=True)
+        pump.start()
+
+        tasks = [asyncio.ensure_future(conversion_worker(converter, stats, deadline))
+                 for _ in range(args.concurrency)]
+        tasks.append(asyncio.ensure_future(refresher(converter, stats, deadline, args.refresh_interval)))
+        tasks.append(asyncio.ensure_future(loop_lag_monitor(stats, deadline)))
+
+        # Growth is measured from the end of the first interval, once everything is warmed up
+        baseline = None
+        started = time.monotonic()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(args.report_interval, max(0.0, deadline - time.monotonic())))
+            ops, latencies, loop_lags = stats.take_interval()
+            baseline = baseline or dict(resource_snapshot(), pending=app.root.pending)
+            print_report(time.monotonic() - started, args.report_interval, ops, latencies, loop_lags,
+                         stats, converter, app, baseline)
+
+        await asyncio.gather(*tasks)
+        stop.set()
+        pump.join()
+    finally:
+        stop.set()
+        tracemalloc.stop()
+        provider.stop()
+
+    print(f"📊 {stats.total_ops} conversions, {stats.refresh_ok + stats.refresh_failed} refreshes "
+          f"({provider.errors} injected errors, {provider.truncated} truncated payloads)")
+    healthy = not stats.async_torn and not stats.gui_torn
+    print("✅ No torn conversions" if healthy else "❌ Torn conversions detected")
+    return 0 if healthy else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=60, help="seconds to run (e.g. 14400 for 4 hours)")
+    parser.add_argument('--concurrency', type=int, default=200, help="concurrent conversion tasks")
+    parser.add_argument('--refresh-interval', type=float, default=3.0)
+    parser.add_argument('--gui-refresh-interval', type=float, default=3.0,
+                        help="seconds between fetch_live_rates calls on the headless GUI")
+    parser.add_argument('--report-interval', type=float, default=10.0)
+    parser.add_argument('--timeout', type=float, default=5.0)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--truncate-rate', type=float, default=0.05)
+    parser.add_argument('--drift', type=float, default=0.001)
+    parser.add_argument('--churn', type=int, default=3)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run_soak(args)))
+
+
+if __name__ == "__main__":
+    main()
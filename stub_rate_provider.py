@@ -0,0 +1,157 @@
+"""Local stand-in for the exchangerate-api feed, with injectable faults"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from currency_data import CURRENCY_MAP
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.provider.handle(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubRateProvider:
+    """Serves a USD-based rate payload shaped like the live API.
+
+    Every request can be delayed (``latency`` + up to ``jitter`` seconds),
+    failed with a 503 (``error_rate``), or cut off partway through the rates
+    object (``truncate_rate``).
+    Rates random-walk by up to ``drift`` per request, and ``churn`` currencies
+    are left out of each payload at random so currencies come and go.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 truncate_rate=0.0, drift=0.001, churn=0, seed=None, instruments=CURRENCY_MAP):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.drift = drift
+        self.churn = churn
+        self.requests = 0
+        self.errors = 0
+        self.truncated = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._rates = {code: round(self._random.uniform(0.01, 500), 6) for code in instruments}
+        self._rates['USD'] = 1
+        self._rates['INR'] = 83.0
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.provider = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v4/latest/USD"
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        # shutdown() waits for serve_forever to exit, so only call it once serving
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def next_payload(self):
+        """Advance the random walk and build the next payload"""
+        with self._lock:
+            rng = self._random
+            for code in self._rates:
+                if code != 'USD':
+                    self._rates[code] = round(self._rates[code] * (1 + rng.uniform(-self.drift, self.drift)), 6)
+            rates = dict(self._rates)
+            candidates = [code for code in rates if code not in ('INR', 'USD')]
+            for code in rng.sample(candidates, min(self.churn, len(candidates))):
+                del rates[code]
+
+        return {
+            'provider': 'stub',
+            'base': 'USD',
+            'date': time.strftime('%Y-%m-%d'),
+            'time_last_updated': int(time.time()),
+            'rates': rates,
+        }
+
+    def handle(self, request):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+            truncate = not fail and self._random.random() < self.truncate_rate
+            if fail:
+                self.errors += 1
+            if truncate:
+                self.truncated += 1
+
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            request.send_error(503, "Injected failure")
+            return
+
+        body = json.dumps(self.next_payload()).encode('utf-8')
+        if truncate:
+            # Anywhere from just inside the rates object to just before its closing brace
+            start = body.index(b'"rates"') + len(b'"rates": {')
+            body = body[:self._random.randint(start, body.rindex(b'}', 0, -1))]
+
+        request.send_response(200)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--truncate-rate', type=float, default=0.0)
+    parser.add_argument('--drift', type=float, default=0.001)
+    parser.add_argument('--churn', type=int, default=0)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    provider = StubRateProvider(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                                args.truncate_rate, args.drift, args.churn, args.seed)
+    print(f"🧪 Stub rate provider on {provider.url}")
+    provider.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Per-tenant spreads, pair overrides and effective-date windows over the live rates"""
+import itertools
+import time
+
+_FOREVER = float('inf')
+
+
+def _timestamp(when, default):
+    if when is None:
+        return default
+    if isinstance(when, (int, float)):
+        return float(when)
+    return when.timestamp()
+
+
+RULE_KINDS = ('spread', 'override')
+
+
+class RateRule:
+    """One tenant rule: a spread (optionally per currency) or a fixed pair rate"""
+
+    __slots__ = ('rule_id', 'tenant', 'kind', 'currency', 'pair', 'value', 'valid_from', 'valid_to')
+
+    def __init__(self, rule_id, tenant, kind, value, currency=None, pair=None,
+                 valid_from=None, valid_to=None):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown rule kind {kind!r}; expected one of {RULE_KINDS}")
+        if kind == 'spread' and not -1 < value < 1:
+            raise ValueError(f"Spread must be between -1 and 1 (exclusive), got {value!r}")
+        if kind == 'override' and not value > 0:
+            raise ValueError(f"Override rate must be positive, got {value!r}")
+
+        self.rule_id = rule_id
+        self.tenant = tenant
+        self.kind = kind
+        self.value = value
+        self.currency = currency
+        self.pair = pair
+        self.valid_from = _timestamp(valid_from, -_FOREVER)
+        self.valid_to = _timestamp(valid_to, _FOREVER)
+        if self.valid_from >= self.valid_to:
+            raise ValueError("valid_from must be before valid_to")
+
+    def active_at(self, now):
+        return self.valid_from <= now < self.valid_to
+
+
+class TenantOverlay:
+    """Rules for one tenant compiled for the window in which they don't change.
+
+    Spreads are stored as multipliers relative to the base rates, so a base
+    rate refresh never needs a recompile; only rule edits and window
+    boundaries do.
+    """
+
+    __slots__ = ('factors', 'default_factor', 'overrides', 'valid_from', 'valid_until')
+
+    def __init__(self, factors, default_factor, overrides, valid_from, valid_until):
+        self.factors = factors
+        self.default_factor = default_factor
+        self.overrides = overrides
+        self.valid_from = valid_from
+        self.valid_until = valid_until
+
+
+class TenantRateEngine:
+    """Applies tenant rules on top of a rate source with a ``snapshot`` attribute.
+
+    ``source`` can be an ``AsyncCurrencyConverter`` or a ``RateBook``; each
+    conversion reads the source's current snapshot, so rules follow live
+    rates automatically. Spreads reduce what the customer receives: a spread
+    of 0.015 pays out 98.5% of the base conversion (a negative spread pays
+    out more). Same-currency conversions are never marked up.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._rules = {}
+        self._tenant_rules = {}
+        self._overlays = {}
+        self._ids = itertools.count(1)
+
+    def add_spread(self, tenant, spread, currency=None, valid_from=None, valid_to=None):
+        """Add a spread for a tenant, for one target currency or (default) all of them"""
+        return self._add(RateRule(next(self._ids), tenant, 'spread', spread,
+                                  currency=currency, valid_from=valid_from, valid_to=valid_to))
+
+    def add_override(self, tenant, from_currency, to_currency, rate, valid_from=None, valid_to=None):
+        """Pin the rate a tenant gets for one currency pair"""
+        return self._add(RateRule(next(self._ids), tenant, 'override', rate,
+                                  pair=(from_currency, to_currency),
+                                  valid_from=valid_from, valid_to=valid_to))
+
+    def remove_rule(self, rule_id):
+        """Remove a rule; returns False if it does not exist"""
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        self._tenant_rules[rule.tenant].remove(rule)
+        self._invalidate(rule.tenant)
+        return True
+
+    def rules(self, tenant):
+        """Rules currently registered for a tenant, oldest first"""
+        return list(self._tenant_rules.get(tenant, ()))
+
+    def _add(self, rule):
+        self._rules[rule.rule_id] = rule
+        self._tenant_rules.setdefault(rule.tenant, []).append(rule)
+        self._invalidate(rule.tenant)
+        return rule.rule_id
+
+    def _invalidate(self, tenant):
+        # Only this tenant is recompiled, and only on its next lookup
+        self._overlays.pop(tenant, None)
+
+    def overlay(self, tenant, now=None):
+        """Return the compiled overlay for a tenant at ``now`` (defaults to the current time)"""
+        if now is None:
+            now = time.time()
+        overlay = self._overlays.get(tenant)
+        if overlay is None or not overlay.valid_from <= now < overlay.valid_until:
+            overlay = self._overlays[tenant] = self._compile(tenant, now)
+        return overlay
+
+    def _compile(self, tenant, now):
+        factors = {}
+        overrides = {}
+        default_factor = 1.0
+        valid_from = -_FOREVER
+        valid_until = _FOREVER
+
+        # Later rules win within the same scope; per-currency spreads beat the tenant-wide one
+        for rule in self._tenant_rules.get(tenant, ()):
+            if rule.active_at(now):
+                valid_from = max(valid_from, rule.valid_from)
+                valid_until = min(valid_until, rule.valid_to)
+                if rule.kind == 'override':
+                    overrides[rule.pair] = rule.value
+                elif rule.currency is None:
+                    default_factor = 1.0 - rule.value
+                else:
+                    factors[rule.currency] = 1.0 - rule.value
+            elif rule.valid_from > now:
+                valid_until = min(valid_until, rule.valid_from)
+            else:
+                valid_from = max(valid_from, rule.valid_to)
+
+        return TenantOverlay(factors, default_factor, overrides, valid_from, valid_until)
+
+    def rate(self, tenant, from_currency, to_currency, now=None):
+        """Effective tenant rate for one unit of ``from_currency``"""
+        return self.convert(tenant, 1.0, from_currency, to_currency, now)
+
+    def convert(self, tenant, amount, from_currency, to_currency, now=None):
+        """Convert for a tenant: one overlay check and one dict lookup on top of a plain conversion"""
+        if from_currency == to_currency:
+            return amount
+
+        overlay = self.overlay(tenant, now)
+        override = overlay.overrides.get((from_currency, to_currency))
+        if override is not None:
+            return amount * override
+
+        result = self.source.snapshot.convert(amount, from_currency, to_currency)
+        return result * overlay.factors.get(to_currency, overlay.default_factor)
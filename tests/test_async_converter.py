@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from async_converter import AsyncCurrencyConverter
+
+OFFLINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'currencyData.txt')
+
+
+class FakeFetcher:
+    """Serves queued feeds in order, repeating the last one"""
+
+    def __init__(self, *feeds, delay=0.0):
+        self.feeds = list(feeds)
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, timeout):
+        with self._lock:
+            self.calls += 1
+            feed = self.feeds.pop(0) if len(self.feeds) > 1 else self.feeds[0]
+        if self.delay:
+            time.sleep(self.delay)
+        if isinstance(feed, Exception):
+            raise feed
+        return feed.items()
+
+
+def feed(inr):
+    return {'USD': 1, 'INR': inr, 'EUR': 0.9}
+
+
+def make_converter(fetcher):
+    return AsyncCurrencyConverter(url='http://stub.invalid', offline_path=OFFLINE_PATH, fetcher=fetcher)
+
+
+def test_concurrent_refreshes_share_one_fetch():
+    fetcher = FakeFetcher(feed(84.0), delay=0.05)
+    converter = make_converter(fetcher)
+
+    async def scenario():
+        return await asyncio.gather(*(converter.refresh() for _ in range(50)))
+
+    assert asyncio.run(scenario()) == [True] * 50
+    assert fetcher.calls == 1
+    assert converter.convert(840, 'Indian Rupee', 'US Dollar') == pytest.approx(10)
+
+
+def test_sequential_refreshes_fetch_again():
+    fetcher = FakeFetcher(feed(84.0), feed(85.0))
+    converter = make_converter(fetcher)
+
+    async def scenario():
+        await converter.refresh()
+        await converter.refresh()
+
+    asyncio.run(scenario())
+    assert fetcher.calls == 2
+    assert converter.rates['Indian Rupee'] == 85.0
+
+
+def test_stream_yields_changed_snapshots_and_drops_stale_ones():
+    fetcher = FakeFetcher(feed(84.0), feed(84.0), feed(85.0), feed(86.0))
+    converter = make_converter(fetcher)
+
+    async def scenario():
+        stream = converter.stream_updates()
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+
+        await converter.refresh()
+        seen = [(await first).rates['Indian Rupee']]
+
+        # No change: nothing is published
+        await converter.refresh()
+        # Two changes before the subscriber reads: only the newest is kept
+        await converter.refresh()
+        await converter.refresh()
+        seen.append((await stream.__anext__()).rates['Indian Rupee'])
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(stream.__anext__(), 0.05)
+        await stream.aclose()
+        return seen
+
+    assert asyncio.run(scenario()) == [84.0, 86.0]
+    assert not converter._subscribers
+
+
+def test_failed_refresh_keeps_previous_rates():
+    fetcher = FakeFetcher(feed(84.0), ValueError("Truncated 'rates' object in payload"))
+    converter = make_converter(fetcher)
+
+    async def scenario():
+        assert await converter.refresh()
+        snapshot = converter.snapshot
+        assert not await converter.refresh()
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+    assert converter.snapshot is snapshot
+    assert converter.rates['Indian Rupee'] == 84.0
+    assert converter.convert_formatted(84, 'Indian Rupee', 'US Dollar') == '$1.00'
+
+
+def test_failed_first_refresh_keeps_offline_rates():
+    converter = make_converter(FakeFetcher(ConnectionError("offline")))
+    offline = converter.snapshot
+
+    assert not asyncio.run(converter.refresh())
+    assert converter.snapshot is offline and not offline.live
+    assert converter.currencies()
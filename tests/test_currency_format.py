@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from currency_format import format_amount, format_amounts, get_formatter, group_indian
+
+
+@pytest.mark.parametrize('value, currency, expected', [
+    (1234.5, 'JPY', '¥1,235'),
+    (1234.5678, 'KWD', 'KD1,234.568'),
+    (0.123456789, 'BTC', '₿0.12345679'),
+    (1234.5, 'US Dollar', '$1,234.50'),
+])
+def test_minor_units(value, currency, expected):
+    assert format_amount(value, currency) == expected
+
+
+@pytest.mark.parametrize('value, currency, expected', [
+    (2.5, 'JPY', '¥3'),
+    (3.5, 'JPY', '¥4'),
+    (0.125, 'USD', '$0.13'),
+    (-0.125, 'USD', '-$0.13'),
+    (-2.5, 'JPY', '-¥3'),
+    (1234.125, 'INR', '₹1,234.13'),
+])
+def test_exact_ties_round_half_up(value, currency, expected):
+    assert format_amount(value, currency) == expected
+
+
+def test_amounts_rounding_to_zero_have_no_minus_sign():
+    assert format_amount(-0.004, 'USD') == '$0.00'
+    assert format_amount(-0.4, 'JPY') == '¥0'
+    assert format_amount(-0.0, 'USD') == '$0.00'
+
+
+def test_sub_unit_values_round_unless_fine():
+    assert format_amount(0.9999, 'JPY') == '¥1'
+    assert format_amount(0.9999, 'JPY', fine=True) == '¥0.9999'
+    assert format_amount(0.125, 'EUR', fine=True) == '€0.125'
+
+
+@pytest.mark.parametrize('value, expected', [
+    (999.5, '₹999.50'),
+    (99999.996, '₹1,00,000.00'),
+    (1234567.89, '₹12,34,567.89'),
+    (123456789, '₹12,34,56,789.00'),
+    (-1234567.891, '-₹12,34,567.89'),
+])
+def test_indian_grouping(value, expected):
+    assert format_amount(value, 'Indian Rupee') == expected
+
+
+def test_group_indian():
+    assert [group_indian(d) for d in ('1', '123', '1234', '123456', '12345678')] == [
+        '1', '123', '1,234', '1,23,456', '1,23,45,678']
+
+
+def test_symbol_after_amount():
+    assert format_amount(1000, 'SEK') == '1,000.00 kr'
+    assert format_amount(-1000, 'SEK') == '-1,000.00 kr'
+
+
+def test_unknown_currency_shares_one_formatter():
+    assert format_amount(1234.5, 'Not A Currency') == '1,234.50'
+    assert get_formatter('Not A Currency') is get_formatter('ZZZ')
+
+
+@pytest.mark.parametrize('currency', ['INR', 'USD', 'JPY', 'BHD', 'SEK'])
+def test_huge_amounts_do_not_overflow_decimal_precision(currency):
+    for value in (1e27, -1e27, 1e300):
+        text = format_amount(value, currency)
+        assert text == format_amounts([value], currency)[0]
+        assert format_amount(value, currency, fine=True) == text
+    assert format_amount(1e27, 'INR').startswith('₹1,00,00,00,00,00,00,00,00,')
+
+
+def test_non_finite_values():
+    assert format_amount(float('nan'), 'USD') == '$nan'
+    assert format_amount(float('inf'), 'INR') == '₹inf'
+
+
+@pytest.mark.parametrize('currency', ['INR', 'USD', 'JPY', 'BHD', 'BTC', 'SEK'])
+def test_format_amounts_matches_format_amount(currency):
+    rng = random.Random(7)
+    values = [rng.uniform(-1e9, 1e9) for _ in range(2000)]
+    values += [round(rng.uniform(-1e4, 1e4), 3) for _ in range(2000)]
+    values += [rng.uniform(-2, 2) for _ in range(500)]
+    values += [0.0, -0.0, 0.5, -0.5, 2.5, 0.125, -0.004, 99999.995, 1e27]
+    for fine in (False, True):
+        assert format_amounts(values, currency, fine) == [format_amount(v, currency, fine) for v in values]
@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from rate_ingest import RateBook, iter_rate_items
+
+PAYLOAD = {
+    'provider': 'test',
+    'base': 'USD',
+    'rates': {'USD': 1, 'INR': 83.25, 'EUR': 0.9123, 'JPY': 151.5, 'GBP': 7.9e-1},
+    'time_last_updated': 1700000000,
+}
+
+
+# Written out by hand so it keeps an exponent the json module would not produce
+RAW_PAYLOAD = ('{"provider": "test", "base": "USD", "rates": {"USD": 1, "INR": 83.25, '
+               '"EUR": 0.9123, "JPY": 151.5, "GBP": 7.9e-1}, "time_last_updated": 1700000000}')
+
+
+def chunks_of(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def split_at(text, marker, offset):
+    cut = text.index(marker) + offset
+    return [text[:cut].encode('utf-8'), text[cut:].encode('utf-8')]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100000])
+def test_iter_rate_items_any_chunk_size(size):
+    text = json.dumps(PAYLOAD)
+    assert dict(iter_rate_items(chunks_of(text, size))) == PAYLOAD['rates']
+
+
+@pytest.mark.parametrize('marker, offset', [
+    ('"rates"', 3),     # inside the key
+    ('"rates"', 7),     # between the key and the colon
+    ('83.25', 3),       # inside a number
+    ('7.9e-1', 4),      # inside an exponent
+    ('"JPY"', 2),       # inside a currency code
+])
+def test_iter_rate_items_split_inside_tokens(marker, offset):
+    assert dict(iter_rate_items(split_at(RAW_PAYLOAD, marker, offset))) == PAYLOAD['rates']
+
+
+def test_iter_rate_items_accepts_str_chunks_and_whitespace():
+    text = json.dumps(PAYLOAD, indent=4)
+    assert dict(iter_rate_items([text[:40], text[40:]])) == PAYLOAD['rates']
+
+
+def test_iter_rate_items_empty_rates():
+    assert list(iter_rate_items([b'{"rates": {  }}'])) == []
+
+
+@pytest.mark.parametrize('cut', [20, 60])
+def test_iter_rate_items_truncated(cut):
+    text = json.dumps({'base': 'USD', 'rates': PAYLOAD['rates']})
+    with pytest.raises(ValueError, match='Truncated'):
+        list(iter_rate_items(chunks_of(text[:len(text) - cut], 5)))
+
+
+def test_iter_rate_items_missing_rates():
+    with pytest.raises(ValueError, match="No 'rates'"):
+        list(iter_rate_items([b'{"base": "USD", "result": "error"}']))
+
+
+def test_iter_rate_items_malformed_pair():
+    with pytest.raises(ValueError):
+        list(iter_rate_items([b'{"rates": {"USD": 1, "EUR" 0.9}}']))
+
+
+def test_rate_book_first_apply_adds_everything():
+    book = RateBook()
+    delta = book.apply({'USD': 1, 'INR': 83.0, 'EUR': 0.9}.items())
+    assert (delta.changed, delta.added, delta.removed) == (0, 3, 0)
+    assert book.snapshot.rates == {'US Dollar': 1, 'Indian Rupee': 83.0, 'Euro': 0.9}
+    assert book.snapshot.currency_symbols['Euro'] == '€'
+    assert book.snapshot.convert(830, 'Indian Rupee', 'US Dollar') == pytest.approx(10)
+
+
+def test_rate_book_change_add_remove():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 83.0, 'EUR': 0.9, 'GBP': 0.8}.items())
+    previous = book.snapshot
+
+    delta = book.apply({'USD': 1, 'INR': 83.0, 'EUR': 0.91, 'JPY': 150}.items())
+    assert (delta.changed, delta.added, delta.removed) == (1, 1, 1)
+    assert delta.names_changed
+    assert book.snapshot.rates == {'US Dollar': 1, 'Indian Rupee': 83.0, 'Euro': 0.91, 'Japanese Yen': 150}
+    assert set(book.snapshot.currency_symbols) == set(book.snapshot.rates)
+    # The published snapshot is never mutated
+    assert previous.rates['Euro'] == 0.9 and 'British Pound Sterling' in previous.rates
+
+
+def test_rate_book_no_change():
+    book = RateBook()
+    feed = {'USD': 1, 'INR': 83.0, 'EUR': 0.9}
+    book.apply(feed.items())
+    delta = book.apply(feed.items())
+    assert delta.count == 0 and not delta.names_changed
+
+
+def test_rate_book_inr_move_is_single_entry():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 83.0, 'EUR': 0.9, 'JPY': 150}.items())
+    delta = book.apply({'USD': 1, 'INR': 84.0, 'EUR': 0.9, 'JPY': 150}.items())
+    assert (delta.changed, delta.added, delta.removed) == (1, 0, 0)
+    assert book.snapshot.convert(840, 'Indian Rupee', 'US Dollar') == pytest.approx(10)
+    assert book.snapshot.convert(1, 'Euro', 'Indian Rupee') == pytest.approx(84.0 / 0.9)
+
+
+def test_rate_book_missing_inr_falls_back():
+    book = RateBook()
+    book.apply({'USD': 1, 'EUR': 0.9}.items())
+    assert book.snapshot.rates['Indian Rupee'] == 83.0
+
+
+def test_rate_book_rejects_feed_without_known_currencies():
+    book = RateBook()
+    with pytest.raises(ValueError):
+        book.apply({'ZZZ': 1}.items())
+
+
+def test_rate_book_shared_name_sibling_keeps_name():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 83.0, 'SLE': 22.5, 'SLL': 22500}.items())
+    assert book.snapshot.rates['Sierra Leonean Leone'] == 22500
+
+    delta = book.apply({'USD': 1, 'INR': 83.0, 'SLE': 22.5}.items())
+    assert book.snapshot.rates['Sierra Leonean Leone'] == 22.5
+    assert (delta.changed, delta.added, delta.removed) == (1, 0, 0)
+
+
+def test_rate_book_shared_name_removed_when_no_code_remains():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 83.0, 'MRO': 357}.items())
+    assert book.snapshot.rates['Mauritanian Ouguiya'] == 357
+
+    delta = book.apply({'USD': 1, 'INR': 83.0}.items())
+    assert 'Mauritanian Ouguiya' not in book.snapshot.rates
+    assert 'Mauritanian Ouguiya' not in book.snapshot.currency_symbols
+    assert (delta.changed, delta.added, delta.removed) == (0, 0, 1)
+
+
+def test_rate_book_shared_name_non_preferred_change_is_not_a_rewrite():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 83.0, 'MRO': 357, 'MRU': 39.7}.items())
+    delta = book.apply({'USD': 1, 'INR': 83.0, 'MRO': 360, 'MRU': 39.7}.items())
+    assert book.snapshot.rates['Mauritanian Ouguiya'] == 39.7
+    assert delta.count == 0
@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+from currency_data import CURRENCY_MAP
+from rate_ingest import RateBook, fetch_rate_items
+from stub_rate_provider import StubRateProvider
+
+
+def test_serves_a_feed_the_rate_book_accepts():
+    with StubRateProvider(seed=1) as provider:
+        rates = dict(fetch_rate_items(provider.url, timeout=5))
+    assert rates.keys() == CURRENCY_MAP.keys()
+    assert rates['USD'] == 1
+    book = RateBook()
+    assert book.apply(rates.items()).added == len(book.snapshot.rates) > 150
+
+
+def test_injected_errors_are_503s():
+    with StubRateProvider(error_rate=1, seed=1) as provider:
+        response = requests.get(provider.url, timeout=5)
+        assert response.status_code == 503
+        with pytest.raises(requests.HTTPError):
+            list(fetch_rate_items(provider.url, timeout=5))
+        assert provider.errors == 2
+
+
+def test_truncated_bodies_are_rejected():
+    with StubRateProvider(truncate_rate=1, seed=1) as provider:
+        for _ in range(20):
+            with pytest.raises(ValueError, match='Truncated'):
+                list(fetch_rate_items(provider.url, timeout=5, chunk_size=512))
+        assert provider.truncated == 20
+
+
+def test_churn_leaves_out_currencies_but_never_usd_or_inr():
+    provider = StubRateProvider(churn=3, seed=1)
+    try:
+        payloads = [provider.next_payload()['rates'] for _ in range(10)]
+    finally:
+        provider.stop()
+
+    for rates in payloads:
+        assert len(rates) == len(CURRENCY_MAP) - 3
+        assert rates['USD'] == 1 and 'INR' in rates
+    # Different currencies drop out from one payload to the next
+    assert len({frozenset(rates) for rates in payloads}) > 1
+
+
+def test_drift_moves_rates_within_bounds():
+    provider = StubRateProvider(drift=0.01, seed=1)
+    try:
+        first = provider.next_payload()['rates']
+        second = provider.next_payload()['rates']
+    finally:
+        provider.stop()
+
+    assert first != second
+    for code, rate in second.items():
+        assert abs(rate / first[code] - 1) <= 0.0101
@@ -0,0 +1,106 @@
+import pytest
+
+from rate_ingest import RateBook
+from tenant_rates import TenantRateEngine
+
+T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def engine():
+    book = RateBook()
+    book.apply({'USD': 1, 'INR': 80.0, 'EUR': 0.8, 'JPY': 150}.items())
+    return TenantRateEngine(book)
+
+
+def test_no_rules_is_plain_conversion(engine):
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(80)
+
+
+def test_spread_tenant_wide_and_per_currency(engine):
+    engine.add_spread('acme', 0.01)
+    engine.add_spread('acme', 0.05, currency='Euro')
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(76)
+    assert engine.convert('acme', 100, 'US Dollar', 'Japanese Yen', now=T0) == pytest.approx(14850)
+    # Other tenants are unaffected
+    assert engine.convert('other', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(80)
+
+
+def test_same_currency_is_never_marked_up(engine):
+    engine.add_spread('acme', 0.02)
+    assert engine.convert('acme', 100, 'Euro', 'Euro', now=T0) == 100
+
+
+def test_override_beats_spread(engine):
+    engine.add_spread('acme', 0.02)
+    engine.add_spread('acme', 0.05, currency='Euro')
+    engine.add_override('acme', 'US Dollar', 'Euro', 0.9)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(90)
+    # The override is for one direction only
+    assert engine.convert('acme', 100, 'Euro', 'US Dollar', now=T0) == pytest.approx(122.5)
+
+
+def test_later_rule_wins_within_scope(engine):
+    engine.add_spread('acme', 0.01, currency='Euro')
+    engine.add_spread('acme', 0.03, currency='Euro')
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(77.6)
+
+
+def test_window_boundaries(engine):
+    engine.add_spread('acme', 0.1, valid_from=T0, valid_to=T0 + 60)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0 - 0.001) == pytest.approx(80)
+    # valid_from is inclusive, valid_to is exclusive
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(72)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0 + 59.999) == pytest.approx(72)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0 + 60) == pytest.approx(80)
+
+
+def test_nested_windows(engine):
+    engine.add_spread('acme', 0.1, valid_from=T0, valid_to=T0 + 100)
+    engine.add_spread('acme', 0.2, valid_from=T0 + 40, valid_to=T0 + 60)
+    expected = [(T0 + 10, 72), (T0 + 40, 64), (T0 + 59, 64), (T0 + 60, 72), (T0 + 100, 80)]
+    for now, payout in expected:
+        assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=now) == pytest.approx(payout)
+
+
+def test_overlay_validity_tracks_next_boundary(engine):
+    engine.add_spread('acme', 0.1, valid_from=T0 + 40, valid_to=T0 + 60)
+    overlay = engine.overlay('acme', T0)
+    assert overlay.valid_until == T0 + 40
+    assert engine.overlay('acme', T0 + 10) is overlay
+    inside = engine.overlay('acme', T0 + 50)
+    assert inside is not overlay
+    assert (inside.valid_from, inside.valid_until) == (T0 + 40, T0 + 60)
+    after = engine.overlay('acme', T0 + 70)
+    assert after.valid_from == T0 + 60 and after.default_factor == 1.0
+
+
+def test_remove_rule(engine):
+    rule_id = engine.add_spread('acme', 0.1)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(72)
+    assert engine.remove_rule(rule_id)
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(80)
+    assert not engine.remove_rule(rule_id)
+    assert engine.rules('acme') == []
+
+
+def test_base_rate_refresh_needs_no_recompile(engine):
+    engine.add_spread('acme', 0.1)
+    overlay = engine.overlay('acme', T0)
+    engine.source.apply({'USD': 1, 'INR': 80.0, 'EUR': 0.9, 'JPY': 150}.items())
+    assert engine.overlay('acme', T0) is overlay
+    assert engine.convert('acme', 100, 'US Dollar', 'Euro', now=T0) == pytest.approx(81)
+
+
+@pytest.mark.parametrize('spread', [1, 1.5, -1, -2])
+def test_spread_out_of_range_rejected(engine, spread):
+    with pytest.raises(ValueError):
+        engine.add_spread('acme', spread)
+
+
+def test_invalid_override_and_window_rejected(engine):
+    with pytest.raises(ValueError):
+        engine.add_override('acme', 'US Dollar', 'Euro', 0)
+    with pytest.raises(ValueError):
+        engine.add_spread('acme', 0.1, valid_from=T0 + 10, valid_to=T0)
+    assert engine.rules('acme') == []